@@ -3,12 +3,22 @@
 # *****************************************************
 # From the terminal / command line, execute either ``bookserver`` or ``python -m bookserver``, which runs the book server.
 
+import platform
+import sys
+
 import uvicorn
 
 
 def run():
     # See https://www.uvicorn.org/deployment/#running-programmatically.
-    uvicorn.run("bookserver.main:app", port=8080)
+    #
+    # The standard uvicorn dependencies provide uvloop, a much faster event loop, and httptools, a faster HTTP parser. Request them explicitly, so that a broken install fails loudly instead of silently falling back to the slower pure-Python versions. These are only installed on the platforms below (see the markers in ``pyproject.toml``); elsewhere, let uvicorn pick what's available.
+    fast = (
+        sys.platform not in ("win32", "cygwin")
+        and platform.python_implementation() != "PyPy"
+    )
+    loop, http = ("uvloop", "httptools") if fast else ("auto", "auto")
+    uvicorn.run("bookserver.main:app", port=8080, loop=loop, http=http)
 
 
 if __name__ == "__main__":
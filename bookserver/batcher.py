@@ -0,0 +1,75 @@
+# ******************************************
+# |docname| - Coalesce concurrent DB lookups
+# ******************************************
+# When a class of students loads a page at the same time, the server receives dozens of nearly-identical requests for the last answer to each question on that page. Rather than sending each one to the database separately, the ``AnswerBatcher`` collects requests which arrive while a query is already running, then fetches all of them with a single query once it finishes.
+#
+# Imports
+# =======
+# These are listed in the order prescribed by `PEP 8`_.
+#
+# Standard library
+# ----------------
+import asyncio
+from typing import Any, Awaitable, Callable, List, Set, Tuple
+
+# Third-party imports
+# -------------------
+# None.
+#
+# Local application imports
+# -------------------------
+# None.
+
+
+# AnswerBatcher
+# =============
+class AnswerBatcher:
+    """
+    Batch calls to ``submit`` into calls to ``fetch_many``, which is passed a list of items and must return a list of results in the same order. When no query is running, a request is dispatched immediately. Otherwise, requests wait for the running query to finish, then are dispatched together; a batch is also dispatched as soon as it holds ``max_batch_size`` items.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+    ):
+        self._fetch_many = fetch_many
+        self.max_batch_size = max_batch_size
+        # The items waiting to be dispatched, each paired with the future for its result.
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        # The queries in flight. The event loop keeps only a weak reference to a task, so this keeps them from being garbage collected before they finish.
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if not self._tasks or len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        return await future
+
+    # Start a query for everything pending. This doesn't wait for the query, so that a new batch can begin collecting immediately.
+    def _dispatch(self):
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_done)
+
+    # Once the last query finishes, send everything which arrived while it ran.
+    def _on_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not self._tasks:
+            self._dispatch()
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self._fetch_many([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                # The caller may have been cancelled (for example, the client disconnected).
+                if not future.done():
+                    future.set_result(result)
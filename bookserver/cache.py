@@ -0,0 +1,130 @@
+# ***************************************
+# |docname| - Redis-backed result caching
+# ***************************************
+# Some endpoints, such as ``/assessment/results``, are polled repeatedly by the Runestone Components with identical parameters. The decorator in this file memoizes the result of an async function in Redis for a short time, so these repeated polls don't each cost a database query.
+#
+# Caching is opt-in: it's enabled only when ``redis_url`` is set (see `config.py`). Even then, Redis is treated as an optimization, not a requirement: if it can't be reached, the decorated function is simply called as if there were no cache.
+#
+# Imports
+# =======
+# These are listed in the order prescribed by `PEP 8`_.
+#
+# Standard library
+# ----------------
+import functools
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+# Third-party imports
+# -------------------
+import orjson
+import redis.asyncio
+from redis.exceptions import RedisError
+
+# Local application imports
+# -------------------------
+from .applogger import rslogger
+from .config import settings
+
+# Redis client
+# ============
+# This client has its own connection pool, shared by everything in the BookServer. Connections are made lazily, on first use. It's ``None`` when caching is disabled.
+redis_client: Optional[redis.asyncio.Redis] = (
+    redis.asyncio.from_url(
+        settings.redis_url, socket_connect_timeout=settings.redis_connect_timeout
+    )
+    if settings.redis_url
+    else None
+)
+
+# After Redis fails, don't try it again until this ``time.monotonic()`` value. Without this, an unreachable server would cost every request a connection timeout.
+_redis_retry_at = 0.0
+
+
+# Return the Redis client, or ``None`` if caching is disabled or Redis recently failed.
+def _get_client() -> Optional[redis.asyncio.Redis]:
+    if redis_client is None or time.monotonic() < _redis_retry_at:
+        return None
+    return redis_client
+
+
+def _redis_failed(e: Exception) -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + settings.redis_retry_interval
+    # Since Redis isn't used again until the retry interval passes, this warns once per interval rather than on every request.
+    rslogger.warning(
+        "Redis unavailable; not caching for %s seconds: %s",
+        settings.redis_retry_interval,
+        e,
+    )
+
+
+# Close all pooled connections; see ``shutdown`` in `main.py`.
+async def term_cache():
+    if redis_client is not None:
+        await redis_client.close()
+
+
+# Memoization
+# ===========
+T = TypeVar("T")
+
+
+# Cached values are stored as JSON rather than pickled, since unpickling data from a shared server could run arbitrary code.
+def _load_json(data: bytes, *args: Any, **kwargs: Any) -> Any:
+    return orjson.loads(data)
+
+
+def redis_memoize(
+    # The number of seconds to cache a result.
+    ttl: int,
+    # A function which is passed the same arguments as the decorated function and returns the Redis key for the result.
+    key: Callable[..., str],
+    # A function which serializes a result to bytes.
+    dumps: Callable[[Any], bytes] = orjson.dumps,
+    # A function which is passed the cached bytes followed by the arguments of the decorated function, and returns the result. The arguments let it choose which type to build.
+    loads: Callable[..., Any] = _load_json,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Memoize the result of an async function in Redis for ``ttl`` seconds. By default, results are stored as JSON. Use ``redis_delete`` with the same key to invalidate a result early.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            client = _get_client()
+            if client is None:
+                return await func(*args, **kwargs)
+
+            cache_key = key(*args, **kwargs)
+            try:
+                cached = await client.get(cache_key)
+            except RedisError as e:
+                _redis_failed(e)
+                return await func(*args, **kwargs)
+            if cached is not None:
+                return loads(cached, *args, **kwargs)
+
+            res = await func(*args, **kwargs)
+            try:
+                await client.setex(cache_key, ttl, dumps(res))
+            except RedisError as e:
+                _redis_failed(e)
+            return res
+
+        return wrapper
+
+    return decorator
+
+
+async def redis_delete(*keys: str) -> None:
+    """
+    Remove the given keys from the cache. If Redis is disabled or unavailable, there's nothing to remove; any value cached before an outage expires before Redis is tried again, provided its TTL is shorter than ``redis_retry_interval``.
+    """
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.delete(*keys)
+    except RedisError as e:
+        _redis_failed(e)
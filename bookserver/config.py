@@ -83,6 +83,14 @@ class Settings(BaseSettings):
             "production": self.prod_dburl,
         }[self.book_server_config.value]
 
+    # Connection pool tuning; these only apply to PostgreSQL, since SQLAlchemy doesn't pool connections to a SQLite file. The SQLAlchemy default of 5 connections is far too few for a classroom of students polling at once.
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    # Recycle connections after this many seconds, so that a server-side idle timeout doesn't leave dead connections in the pool.
+    db_pool_recycle: int = 1800
+    # SQLAlchemy's asyncpg driver prepares each statement on the server once per connection, keeping this many in an LRU cache. The batched last-answer query (see ``fetch_last_answer_table_entries``) has a different SQL string for each batch size and answer table, which would thrash asyncpg's default of 100.
+    db_prepared_statement_cache_size: int = 500
+
     # Determine the database type from the URL.
     @property
     def database_type(self) -> DatabaseType:
@@ -94,6 +102,13 @@ class Settings(BaseSettings):
         else:
             raise RuntimeError(f"Unknown database type; URL is {dburl}.")
 
+    # The Redis server used to cache frequently-requested results, such as ``redis://localhost:6379/0``; see `cache.py`. Leave this empty to disable caching.
+    redis_url: str = ""
+    # How long (in seconds) to wait when connecting to Redis before giving up and falling back to the database.
+    redis_connect_timeout: float = 1.0
+    # After Redis fails, how long (in seconds) to go without it before trying again.
+    redis_retry_interval: float = 30.0
+
     # Configure ads. TODO: Link to the place in the Runestone Components where this is used.
     adsenseid: str = ""
     num_banners: int = 0
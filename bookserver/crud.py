@@ -12,7 +12,8 @@
 #
 # Standard library
 # ----------------
-from typing import List, Optional
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
 import datetime
 
 
@@ -21,14 +22,19 @@ import datetime
 from .db import async_session
 from pydal.validators import CRYPT
 from fastapi.exceptions import HTTPException
+import orjson
+from pydantic import BaseModel
 
 # import sqlalchemy
-from sqlalchemy import and_
+from sqlalchemy import and_, exists, func, tuple_
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import select
 
 # Local application imports
 # -------------------------
 from .applogger import rslogger
+from .batcher import AnswerBatcher
+from .cache import redis_delete, redis_memoize
 from . import schemas
 from .models import (
     Code,
@@ -37,6 +43,7 @@ from .models import (
     CourseInstructorValidator,
     answer_tables,
     AuthUser,
+    AuthUserInstructorValidator,
     AuthUserValidator,
     Courses,
     CoursesValidator,
@@ -66,9 +73,9 @@ EVENT2TABLE = {
 async def create_useinfo_entry(log_entry: UseinfoValidation) -> UseinfoValidation:
     async with async_session.begin() as session:
         new_entry = Useinfo(**log_entry.dict())
-        rslogger.debug(f"timestamp = {log_entry.timestamp} ")
-        rslogger.debug(f"New Entry = {new_entry}")
-        rslogger.debug(f"session = {session}")
+        rslogger.debug("timestamp = %s ", log_entry.timestamp)
+        rslogger.debug("New Entry = %s", new_entry)
+        rslogger.debug("session = %s", session)
         session.add(new_entry)
     rslogger.debug(new_entry)
     return UseinfoValidation.from_orm(new_entry)
@@ -76,43 +83,138 @@ async def create_useinfo_entry(log_entry: UseinfoValidation) -> UseinfoValidatio
 
 # xxx_answers
 # -----------
+# The Runestone Components poll for the last answer to a question, so cache it briefly; see `cache.py`. Since a ``div_id`` identifies a single question (and therefore a single answer table), the key doesn't need the event.
+LAST_ANSWER_CACHE_TTL = 3
+
+# The validator for one of the answer tables. These are generated at runtime by ``register_answer_table``, so there's no static type to name.
+AnswerValidator = Any
+
+
+def last_answer_key(course_name: str, sid: Optional[str], div_id: str) -> str:
+    return f"lae:{course_name}:{sid}:{div_id}"
+
+
+# Cache last answers as JSON; the answer table for the query determines which validator rebuilds the cached answer.
+def _dump_last_answer(answer: Optional[BaseModel]) -> bytes:
+    return orjson.dumps(answer.dict() if answer else None)
+
+
+def _load_last_answer(
+    data: bytes, query_data: schemas.AssessmentRequest
+) -> Optional[BaseModel]:
+    answer = orjson.loads(data)
+    if answer is None:
+        return None
+    return validation_tables[EVENT2TABLE[query_data.event]](**answer)
+
+
 async def create_answer_table_entry(
     # The correct type is one of the validators for an answer table; we use LogItemIncoming as a generalization of this.
     log_entry: schemas.LogItemIncoming,
     # The event type.
     event: str,
 ) -> schemas.LogItemIncoming:
-    rslogger.debug(f"hello from create at {log_entry}")
+    rslogger.debug("hello from create at %s", log_entry)
     table_name = EVENT2TABLE[event]
     tbl = answer_tables[table_name]
     new_entry = tbl(**log_entry.dict())
     async with async_session.begin() as session:
         session.add(new_entry)
+    # The cached last answer is now stale.
+    await redis_delete(
+        last_answer_key(log_entry.course_name, log_entry.sid, log_entry.div_id)
+    )
 
-    rslogger.debug(f"returning {new_entry}")
+    rslogger.debug("returning %s", new_entry)
     return validation_tables[table_name].from_orm(new_entry)
 
 
+@redis_memoize(
+    ttl=LAST_ANSWER_CACHE_TTL,
+    key=lambda query_data: last_answer_key(
+        query_data.course, query_data.sid, query_data.div_id
+    ),
+    dumps=_dump_last_answer,
+    loads=_load_last_answer,
+)
 async def fetch_last_answer_table_entry(
     query_data: schemas.AssessmentRequest,
-) -> schemas.LogItemIncoming:
+) -> Optional[AnswerValidator]:
+    # Check the event here, so that a bad event fails only this request instead of the batch it would join.
     assessment = EVENT2TABLE[query_data.event]
-    tbl = answer_tables[assessment]
-    query = (
-        select(tbl)
-        .where(
-            and_(
-                tbl.div_id == query_data.div_id,
-                tbl.course_name == query_data.course,
-                tbl.sid == query_data.sid,
-            )
+    if assessment not in answer_tables:
+        raise KeyError(assessment)
+    return await answer_batcher.submit(query_data)
+
+
+# The ``(course_name, sid, div_id)`` which identifies a student's answers to a question.
+AnswerKey = Tuple[str, Optional[str], str]
+
+
+# Fetch the last answer for each of the provided queries, returning ``None`` for any query with no answer. This is used by ``answer_batcher``; call ``fetch_last_answer_table_entry`` instead.
+async def fetch_last_answer_table_entries(
+    queries: List[schemas.AssessmentRequest],
+) -> List[Optional[AnswerValidator]]:
+    # Group the queries by answer table, so that each table needs only one query.
+    table_keys: Dict[str, Set[AnswerKey]] = defaultdict(set)
+    for query_data in queries:
+        table_keys[EVENT2TABLE[query_data.event]].add(
+            (query_data.course, query_data.sid, query_data.div_id)
         )
-        .order_by(tbl.timestamp.desc())
-    )
+
+    last_answers: Dict[Tuple[str, AnswerKey], AnswerValidator] = {}
     async with async_session() as session:
-        res = await session.execute(query)
-        rslogger.debug(f"res = {res}")
-        return validation_tables[assessment].from_orm(res.scalars().first())
+        for assessment, keys in table_keys.items():
+            tbl = answer_tables[assessment]
+            if len(keys) == 1:
+                # Under light load most batches hold a single request; the database only needs to find one row for these.
+                ((course_name, sid, div_id),) = keys
+                query = (
+                    select(tbl)
+                    .where(
+                        and_(
+                            tbl.course_name == course_name,
+                            tbl.sid == sid,
+                            tbl.div_id == div_id,
+                        )
+                    )
+                    .order_by(tbl.timestamp.desc())
+                    .limit(1)
+                )
+            else:
+                # Number each key's answers from newest to oldest, then keep only the newest, so the database returns one row per key instead of each student's entire history.
+                newest_first = (
+                    func.row_number()
+                    .over(
+                        partition_by=(tbl.course_name, tbl.sid, tbl.div_id),
+                        order_by=tbl.timestamp.desc(),
+                    )
+                    .label("newest_first")
+                )
+                ranked = (
+                    select(tbl, newest_first)
+                    .where(tuple_(tbl.course_name, tbl.sid, tbl.div_id).in_(keys))
+                    .subquery()
+                )
+                query = select(aliased(tbl, ranked)).where(ranked.c.newest_first == 1)
+            res = await session.execute(query)
+            for row in res.scalars():
+                key = (assessment, (row.course_name, row.sid, row.div_id))
+                if key not in last_answers:
+                    last_answers[key] = validation_tables[assessment].from_orm(row)
+
+    return [
+        last_answers.get(
+            (
+                EVENT2TABLE[query_data.event],
+                (query_data.course, query_data.sid, query_data.div_id),
+            )
+        )
+        for query_data in queries
+    ]
+
+
+answer_batcher = AnswerBatcher(fetch_last_answer_table_entries)
 
 
 # Courses
@@ -141,11 +243,38 @@ async def fetch_user(user_name: str) -> AuthUserValidator:
     query = select(AuthUser).where(AuthUser.username == user_name)
     async with async_session() as session:
         res = await session.execute(query)
-        rslogger.debug(f"res = {res}")
+        rslogger.debug("res = %s", res)
         user = res.scalars().one_or_none()
     return AuthUserValidator.from_orm(user) if user else None
 
 
+async def fetch_user_with_instructor_status(
+    user_name: str,
+) -> Optional[AuthUserInstructorValidator]:
+    """
+    Fetch a user and determine if they are an instructor for their current course, using a single query.
+    """
+    is_instructor = (
+        exists()
+        .where(
+            and_(
+                CourseInstructor.instructor == AuthUser.id,
+                CourseInstructor.course == AuthUser.course_id,
+            )
+        )
+        .label("is_instructor")
+    )
+    query = select(AuthUser, is_instructor).where(AuthUser.username == user_name)
+    async with async_session() as session:
+        res = await session.execute(query)
+        row = res.one_or_none()
+    if row is None:
+        return None
+    user = AuthUserInstructorValidator.from_orm(row.AuthUser)
+    user.is_instructor = bool(row.is_instructor)
+    return user
+
+
 async def create_user(user: AuthUserValidator) -> Optional[AuthUserValidator]:
     """
     The given user will have the password in plain text.  First we will hash
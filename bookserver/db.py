@@ -9,14 +9,19 @@
 #
 # Standard library
 # ----------------
+import asyncio
+from typing import Any, Dict
 
 #
 # Third-party imports
 # -------------------
 # Use asyncio for SQLAlchemy -- see `SQLAlchemy Asynchronous I/O (asyncio) <https://docs.sqlalchemy.org/en/14/orm/extensions/asyncio.html>`_.
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql import text
 
 # Local application imports
 # -------------------------
@@ -24,14 +29,40 @@ from .config import settings, BookServerConfig, DatabaseType
 
 
 if settings.database_type == DatabaseType.SQLite:
-    connect_args = {"check_same_thread": False}
+    connect_args: Dict[str, Any] = {"check_same_thread": False}
+    # SQLAlchemy uses a ``NullPool`` for SQLite files, which doesn't accept any pool options.
+    pool_args: Dict[str, Any] = {}
 else:
-    connect_args = {}
+    connect_args = {
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size
+    }
+    # See `Connection Pooling <https://docs.sqlalchemy.org/en/14/core/pooling.html>`_. ``pool_pre_ping`` discards connections the database closed while they sat in the pool, instead of failing the request which checks one out.
+    pool_args = dict(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+    )
 
 # TODO: Remove the ``echo=True`` when done debugging.
 engine = create_async_engine(
-    settings.database_url, connect_args=connect_args, echo=True
+    settings.database_url, connect_args=connect_args, echo=True, **pool_args
 )
+
+if (
+    settings.database_type == DatabaseType.SQLite
+    and settings.book_server_config == BookServerConfig.test
+):
+    # Speed up the test database, which the fixtures empty before every test. Use `write-ahead logging <https://www.sqlite.org/wal.html>`_, so that readers don't block on a writer. With ``synchronous=NORMAL``, SQLite then syncs to disk only at checkpoints instead of on every commit; the most recent commits may be lost on power failure, which is why this isn't used for production data. See `Setting SQLite pragmas <https://docs.sqlalchemy.org/en/14/dialects/sqlite.html#foreign-key-support>`_ for this approach.
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
 # This creates the SessionLocal class.  An actual session is an instance of this class.
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -51,11 +82,37 @@ async def init_models():
         await conn.run_sync(Base.metadata.create_all)
 
 
+# Open a full pool of connections at startup, so that the first requests don't each wait for a new connection to the database. There's nothing to warm for SQLite, which isn't pooled.
+async def warm_pool():
+    if settings.database_type != DatabaseType.PostgreSQL:
+        return
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Running these concurrently forces each to open its own connection; all are returned to the pool when done.
+    await asyncio.gather(*[ping() for _ in range(settings.db_pool_size)])
+
+
 # If the engine isn't disposed of, then a PostgreSQL database will remain in a pseudo-locked state, refusing to drop of truncate tables (see `bookserver_session`).
 async def term_models():
     await engine.dispose()
 
 
+# Report on the state of the connection pool; a pool which is always fully checked out means requests are waiting for a connection.
+def pool_status() -> dict:
+    pool = engine.pool
+    status = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
 # Dependency
 async def get_session() -> AsyncSession:
     async with async_session() as session:
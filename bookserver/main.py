@@ -15,30 +15,48 @@ import json
 # -------------------
 from fastapi import FastAPI, Request, Depends, Cookie, status
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse, JSONResponse
 from pydantic.error_wrappers import ValidationError
 from typing import Optional
 
 # Local application imports
 # -------------------------
 from .applogger import rslogger
+from .cache import term_cache
 from .config import settings
 from .crud import create_initial_courses_users
-from .db import init_models, term_models
+from .db import init_models, pool_status, term_models, warm_pool
 from .routers import assessment
 from .routers import auth
 from .routers import books
 from .routers import rslogging
-from .session import auth_manager
+from .session import AuthContext, auth_manager
 
 # FastAPI setup
 # =============
-app = FastAPI()
+# Serialize responses using orjson, which is much faster than the standard library's ``json``.
+app = FastAPI(default_response_class=ORJSONResponse)
 print(f"Serving books from {settings.book_path}.\n")
 
-# Install the auth_manager as middleware This will make the user
-# part of the request ``request.state.user`` `See FastAPI_Login Advanced <https://fastapi-login.readthedocs.io/advanced_usage/>`_
-auth_manager.useRequest(app)
+
+# Authenticate the user on every request. Like the auth_manager's ``useRequest`` middleware, this makes the user
+# part of the request ``request.state.user`` (or ``None`` if not logged in). `See FastAPI_Login Advanced <https://fastapi-login.readthedocs.io/advanced_usage/>`_
+# It also stores an ``AuthContext`` in ``request.state.auth`` for use by frequently-called endpoints. The user loader fetches the user's instructor status in the same query as the user, so endpoints can check it for free.
+@app.middleware("http")
+async def auth_middleware(request: Request, call_next):
+    try:
+        user = await auth_manager(request)
+    except Exception:
+        # Not logged in, or the token is invalid or expired.
+        user = None
+    request.state.user = user
+    request.state.auth = (
+        AuthContext(user.id, user.username, user.course_id, user.is_instructor)
+        if user
+        else None
+    )
+    return await call_next(request)
+
 
 # Routing
 # -------
@@ -59,11 +77,13 @@ app.include_router(auth.router)
 async def startup():
     await init_models()
     await create_initial_courses_users()
+    await warm_pool()
 
 
 @app.on_event("shutdown")
 async def shutdown():
     await term_models()
+    await term_cache()
 
 
 #
@@ -102,6 +122,12 @@ def read_root():
     return {"Hello": "World"}
 
 
+# Provide a health check for load balancers and monitoring, including the state of the database connection pool.
+@app.get("/health")
+def health():
+    return {"pool": pool_status()}
+
+
 class NotAuthenticatedException(Exception):
     pass
 
@@ -382,6 +382,11 @@ class CourseInstructor(Base, IdMixin):
 CourseInstructorValidator = sqlalchemy_to_pydantic(CourseInstructor)
 
 
+# A user, plus whether that user is an instructor for their current course. See ``fetch_user_with_instructor_status``.
+class AuthUserInstructorValidator(AuthUserValidator):
+    is_instructor: bool = False
+
+
 # Enrollments
 # -----------
 #
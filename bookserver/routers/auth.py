@@ -15,7 +15,6 @@
 # Standard library
 # ----------------
 from bookserver.models import AuthUserValidator
-from datetime import timedelta
 
 #
 # Third-party imports
@@ -29,7 +28,7 @@ from pydal.validators import CRYPT
 
 # Local application imports
 # -------------------------
-from ..session import load_user, auth_manager
+from ..session import create_access_token, load_user, auth_manager
 from ..applogger import rslogger
 from ..config import settings
 from ..crud import create_user
@@ -96,9 +95,7 @@ async def login(
         if str(crypt(password)[0]) != user.password:
             raise InvalidCredentialsException
 
-    access_token = auth_manager.create_access_token(
-        data={"sub": user.username}, expires=timedelta(hours=12)
-    )
+    access_token = create_access_token(user.username)
     response = RedirectResponse(
         "http://localhost:8080/books/published/overview/index.html"
     )
@@ -59,7 +59,7 @@ async def get_static(course: str, filepath: str):
     filepath = safe_join(
         settings.book_path, course, "build", course, "_static", filepath
     )
-    rslogger.debug(f"GETTING: {filepath}")
+    rslogger.debug("GETTING: %s", filepath)
     return FileResponse(filepath)
 
 
@@ -68,7 +68,7 @@ async def get_image(course: str, filepath: str):
     filepath = safe_join(
         settings.book_path, course, "build", course, "_images", filepath
     )
-    rslogger.debug(f"GETTING: {filepath}")
+    rslogger.debug("GETTING: %s", filepath)
     return FileResponse(filepath)
 
 
@@ -86,7 +86,7 @@ async def serve_page(
     pagepath: constr(max_length=512),  # type: ignore
     user=Depends(auth_manager),
 ):
-    rslogger.debug(f"user = {user}, course = {course}")
+    rslogger.debug("user = %s, course = %s", user, course)
     course_row = await fetch_base_course(course)
     if not course_row:
         raise HTTPException(status_code=404, detail=f"Course {course} not found")
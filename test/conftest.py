@@ -20,17 +20,19 @@
 #
 # Standard library
 # ----------------
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import os
 import subprocess
 import sys
 from threading import Thread
+import time
 from shutil import rmtree, copytree
 from urllib.error import URLError
 from urllib.request import urlopen
 
 # Third-party imports
 # -------------------
-from fastapi.testclient import TestClient
 from _pytest.monkeypatch import MonkeyPatch
 import pytest
 from pyvirtualdisplay import Display
@@ -38,10 +40,7 @@ from pyvirtualdisplay import Display
 # Since ``selenium_driver`` is a parameter to a function (which is a fixture), flake8 sees it as unused. However, pytest understands this as a request for the ``selenium_driver`` fixture and needs it.
 from runestone.shared_conftest import _SeleniumUtils, selenium_driver  # noqa: F401
 from selenium import webdriver
-from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
 from sqlalchemy.sql import text
 
 # Local imports
@@ -51,6 +50,7 @@ from bookserver.db import async_session, engine
 from bookserver.crud import create_user, create_course
 from bookserver.main import app
 from bookserver.models import AuthUserValidator, CoursesValidator
+from bookserver.session import auth_manager, create_access_token
 from .ci_utils import xqt, pushd
 
 
@@ -91,6 +91,26 @@ def bookserver_address():
     return "http://localhost:8080"
 
 
+# Run the app's startup then shutdown handlers. This initializes the database without the thread and HTTP client a ``TestClient`` would create.
+async def _run_lifespan():
+    await app.router.startup()
+    await app.router.shutdown()
+
+
+# Replace the test book at ``test_book_path`` with a fresh copy.
+def _copy_test_book(test_book_path):
+    # Sometimes this fails for no good reason on Windows, typically when a virus scanner briefly locks a file. Retry with an exponential backoff to give the lock time to clear. ``copytree`` requires that the destination not exist, so remove any partial copy first.
+    for retry in range(5):
+        rmtree(test_book_path, ignore_errors=True)
+        try:
+            copytree(f"{settings.web2py_path}/tests/test_course_1", test_book_path)
+            break
+        except OSError:
+            if retry == 4:
+                raise
+            time.sleep(0.05 * 2 ** retry)
+
+
 # This fixture starts and shuts down the web2py server.
 #
 # Execute this `fixture <https://docs.pytest.org/en/latest/fixture.html>`_ once per `session <https://docs.pytest.org/en/latest/fixture.html#scope-sharing-a-fixture-instance-across-tests-in-a-class-module-or-session>`_.
@@ -99,24 +119,14 @@ def run_bookserver(bookserver_address, pytestconfig):
     if pytestconfig.getoption("skipdbinit"):
         print("Skipping DB initialization.")
     else:
-        # Copy the test book to the books directory.
+        # Copy the test book to the books directory. This is IO-bound, so do it in a thread while the app initializes the database.
         test_book_path = f"{settings.book_path}/test_course_1"
-        rmtree(test_book_path, ignore_errors=True)
-        # Sometimes this fails for no good reason on Windows. Retry.
-        for retry in range(100):
-            try:
-                copytree(
-                    f"{settings.web2py_path}/tests/test_course_1",
-                    test_book_path,
-                )
-                break
-            except OSError:
-                if retry == 99:
-                    raise
-
-        # Start the app to initialize the database.
-        with TestClient(app):
-            pass
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            copy_future = executor.submit(_copy_test_book, test_book_path)
+            # Start the app to initialize the database.
+            asyncio.run(_run_lifespan())
+            # The build below needs the book, so wait for the copy (raising any error it produced).
+            copy_future.result()
 
         # Build the test book to add in db fields needed.
         with pushd(test_book_path), MonkeyPatch().context() as m:
@@ -231,81 +241,84 @@ def run_bookserver(bookserver_address, pytestconfig):
 #
 # bookserver_session
 # ------------------
+# These tables are emptied before each test. This list was generated by running the following query, taken from
+# https://dba.stackexchange.com/a/173117. Note that the query excludes
+# specific tables, which the ``runestone build`` populates and which
+# should not be modified otherwise. One method to identify these tables
+# which should not be truncated is to run ``pg_dump --data-only
+# $TEST_DBURL > out.sql`` on a clean database, then inspect the output to
+# see which tables have data. It also excludes all the scheduler tables,
+# since truncating these tables makes the process take a lot longer.
+#
+# The query is:
+## SELECT input_table_name AS truncate_query FROM(SELECT table_name AS input_table_name FROM information_schema.tables WHERE table_schema NOT IN ('pg_catalog', 'information_schema') AND table_name NOT IN ('questions', 'source_code', 'chapters', 'sub_chapters', 'scheduler_run', 'scheduler_task', 'scheduler_task_deps', 'scheduler_worker') AND table_schema NOT LIKE 'pg_toast%') AS information order by input_table_name;
+_TABLES = tuple(
+    """
+    assignment_questions
+    assignments
+    auth_cas
+    auth_event
+    auth_group
+    auth_membership
+    auth_permission
+    auth_user
+    clickablearea_answers
+    code
+    codelens_answers
+    course_attributes
+    course_instructor
+    course_practice
+    courses
+    dragndrop_answers
+    fitb_answers
+    grades
+    lp_answers
+    invoice_request
+    lti_keys
+    mchoice_answers
+    parsons_answers
+    payments
+    practice_grades
+    question_grades
+    question_tags
+    shortanswer_answers
+    sub_chapter_taught
+    tags
+    timed_exam
+    useinfo
+    user_biography
+    user_chapter_progress
+    user_courses
+    user_state
+    user_sub_chapter_progress
+    user_topic_practice
+    user_topic_practice_completion
+    user_topic_practice_feedback
+    user_topic_practice_log
+    user_topic_practice_survey
+    web2py_session_runestone
+    """.split()
+)
+# Since this fixture runs for every test, build the SQL once here.
+_TRUNCATE_STMT = text(f"TRUNCATE {', '.join(_TABLES)} CASCADE;")
+_DELETE_STMTS = tuple(f"DELETE FROM {table};" for table in _TABLES)
+
+
 # This fixture provides access to a clean instance of the Runestone database.
 @pytest.fixture
 async def bookserver_session(run_bookserver):
     # **Clean the database state before a test**
     ##------------------------------------------
-    # This list was generated by running the following query, taken from
-    # https://dba.stackexchange.com/a/173117. Note that the query excludes
-    # specific tables, which the ``runestone build`` populates and which
-    # should not be modified otherwise. One method to identify these tables
-    # which should not be truncated is to run ``pg_dump --data-only
-    # $TEST_DBURL > out.sql`` on a clean database, then inspect the output to
-    # see which tables have data. It also excludes all the scheduler tables,
-    # since truncating these tables makes the process take a lot longer.
-    #
-    # The query is:
-    ## SELECT input_table_name AS truncate_query FROM(SELECT table_name AS input_table_name FROM information_schema.tables WHERE table_schema NOT IN ('pg_catalog', 'information_schema') AND table_name NOT IN ('questions', 'source_code', 'chapters', 'sub_chapters', 'scheduler_run', 'scheduler_task', 'scheduler_task_deps', 'scheduler_worker') AND table_schema NOT LIKE 'pg_toast%') AS information order by input_table_name;
-    tables_to_delete = (
-        """
-        assignment_questions
-        assignments
-        auth_cas
-        auth_event
-        auth_group
-        auth_membership
-        auth_permission
-        auth_user
-        clickablearea_answers
-        code
-        codelens_answers
-        course_attributes
-        course_instructor
-        course_practice
-        courses
-        dragndrop_answers
-        fitb_answers
-        grades
-        lp_answers
-        invoice_request
-        lti_keys
-        mchoice_answers
-        parsons_answers
-        payments
-        practice_grades
-        question_grades
-        question_tags
-        shortanswer_answers
-        sub_chapter_taught
-        tags
-        timed_exam
-        useinfo
-        user_biography
-        user_chapter_progress
-        user_courses
-        user_state
-        user_sub_chapter_progress
-        user_topic_practice
-        user_topic_practice_completion
-        user_topic_practice_feedback
-        user_topic_practice_log
-        user_topic_practice_survey
-        web2py_session_runestone
-        """
-    ).split()
-
     async with engine.begin() as conn:
         if settings.database_type == DatabaseType.PostgreSQL:
-            tables = ", ".join(tables_to_delete)
-            await conn.execute(text(f"TRUNCATE {tables} CASCADE;"))
+            await conn.execute(_TRUNCATE_STMT)
         else:
-            for table in tables_to_delete:
-                print(table)
+            # SQLite has no ``TRUNCATE``. All the deletes share the single transaction opened above, so there's only one commit (and one sync to disk); ``exec_driver_sql`` skips SQLAlchemy's statement compilation, since these are plain SQL strings.
+            for stmt in _DELETE_STMTS:
                 try:
-                    await conn.execute(text(f"DELETE FROM {table};"))
+                    await conn.exec_driver_sql(stmt)
                 except Exception as e:
-                    print(e)
+                    print(f"{stmt} {e}")
 
     # The database is clean. Proceed with the test.
     yield async_session
@@ -403,26 +416,19 @@ class _SeleniumServerUtils(_SeleniumUtils):
         test_user,
     ):
 
-        self.get("auth/login")
-        self.driver.find_element_by_id("loginuser").send_keys(test_user.username)
-        self.driver.find_element_by_id("loginpw").send_keys(test_user.password)
-        self.driver.find_element_by_id("login_button").click()
+        # Rather than filling in and submitting the login form, which costs several round trips to the browser and server, create the access token the ``/auth/validate`` endpoint would produce and hand it to the browser as a cookie. Selenium only sets cookies for the current domain, so first visit a cheap page on the server.
+        self.get("")
+        self.driver.add_cookie(
+            {
+                "name": auth_manager.cookie_name,
+                "value": create_access_token(test_user.username),
+            }
+        )
         self.user = test_user
 
     def logout(self):
-        # TODO: No such endpoint.
-        return
-        self.get("auth/logout")
-        # For some strange reason, the server occasionally doesn't put the "Logged out" message on a logout. ???
-        try:
-            self.wait.until(
-                EC.text_to_be_present_in_element(
-                    (By.CSS_SELECTOR, "div.flash"), "Logged out"
-                )
-            )
-        except TimeoutException:
-            # Assume that visiting the logout URL then waiting for a timeout will ensure the logout worked, even if the message can't be found.
-            pass
+        # TODO: No such endpoint. Until there is, removing the access token logs the browser out.
+        self.driver.delete_cookie(auth_manager.cookie_name)
         self.user = None
 
     def get_book_url(self, url):
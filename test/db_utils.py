@@ -0,0 +1,42 @@
+# ******************************************
+# |docname| - Database utilities for testing
+# ******************************************
+# Answers and log entries must belong to an existing course. The ``bookserver_session`` fixture in `conftest.py` provides a clean database, but needs a running server. These functions let a lighter-weight test create its own course, then remove the course and everything logged for it.
+#
+# Imports
+# =======
+# These are listed in the order prescribed by `PEP 8`_.
+#
+# Standard library
+# ----------------
+import datetime
+
+# Third-party imports
+# -------------------
+from sqlalchemy import delete
+
+# Local application imports
+# -------------------------
+from bookserver.crud import create_course
+from bookserver.db import async_session
+from bookserver.models import Courses, CoursesValidator, Useinfo, answer_tables
+
+
+# Support code
+# ============
+async def add_course(course_name: str) -> None:
+    await create_course(
+        CoursesValidator(
+            course_name=course_name,
+            base_course=course_name,
+            term_start_date=datetime.date(2000, 1, 1),
+        )
+    )
+
+
+async def remove_course(course_name: str) -> None:
+    async with async_session.begin() as session:
+        for tbl in answer_tables.values():
+            await session.execute(delete(tbl).where(tbl.course_name == course_name))
+        await session.execute(delete(Useinfo).where(Useinfo.course_id == course_name))
+        await session.execute(delete(Courses).where(Courses.course_name == course_name))
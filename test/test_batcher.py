@@ -0,0 +1,105 @@
+# ************************************
+# |docname| - test the request batcher
+# ************************************
+#
+# Imports
+# =======
+# These are listed in the order prescribed by `PEP 8`_.
+#
+# Standard library
+# ----------------
+import asyncio
+import datetime
+import uuid
+
+# Third-party imports
+# -------------------
+import pytest
+
+# Local application imports
+# -------------------------
+from bookserver.batcher import AnswerBatcher
+from bookserver.crud import create_answer_table_entry, fetch_last_answer_table_entries
+from bookserver.db import init_models
+from bookserver.models import validation_tables
+from bookserver.schemas import AssessmentRequest
+from .db_utils import add_course, remove_course
+
+
+# Tests
+# =====
+@pytest.mark.asyncio
+async def test_batches_concurrent_requests():
+    batches = []
+
+    async def fetch_many(items):
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    batcher = AnswerBatcher(fetch_many, max_batch_size=4)
+    results = await asyncio.gather(*[batcher.submit(i) for i in range(6)])
+    assert results == [0, 2, 4, 6, 8, 10]
+    # The first request is dispatched immediately. Requests arriving while it runs are dispatched when a batch fills, or when the running queries finish.
+    assert batches == [[0], [1, 2, 3, 4], [5]]
+
+
+@pytest.mark.asyncio
+async def test_lone_request_does_not_wait():
+    async def fetch_many(items):
+        return items
+
+    batcher = AnswerBatcher(fetch_many)
+    # With no query running, the request must be dispatched without a delay.
+    assert await asyncio.wait_for(batcher.submit(1), timeout=0.01) == 1
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_request():
+    async def fetch_many(items):
+        raise RuntimeError("db down")
+
+    batcher = AnswerBatcher(fetch_many)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+# Each student answers several times; a batch must return only the newest answer for each.
+@pytest.mark.asyncio
+async def test_fetch_newest_answer_per_key():
+    await init_models()
+    course_name = f"test_batch_{uuid.uuid4().hex}"
+    await add_course(course_name)
+    try:
+        start = datetime.datetime.utcnow()
+        for sid in ("student_a", "student_b"):
+            for minutes, answer in enumerate(("0", "1", "2")):
+                await create_answer_table_entry(
+                    validation_tables["mchoice_answers"](
+                        timestamp=start + datetime.timedelta(minutes=minutes),
+                        div_id="test_batch_mc",
+                        sid=sid,
+                        course_name=course_name,
+                        correct=False,
+                        answer=f"{sid}:{answer}",
+                        percent=0.0,
+                    ),
+                    "mChoice",
+                )
+
+        results = await fetch_last_answer_table_entries(
+            [
+                AssessmentRequest(
+                    course=course_name, div_id="test_batch_mc", event="mChoice", sid=sid
+                )
+                for sid in ("student_a", "student_b", "student_c")
+            ]
+        )
+        assert [result and result.answer for result in results] == [
+            "student_a:2",
+            "student_b:2",
+            None,
+        ]
+    finally:
+        await remove_course(course_name)
@@ -0,0 +1,151 @@
+# **********************************
+# |docname| - test the Redis caching
+# **********************************
+# These tests replace the Redis client with a simple in-memory stand-in, so they don't need a Redis server.
+#
+# Imports
+# =======
+# These are listed in the order prescribed by `PEP 8`_.
+#
+# Standard library
+# ----------------
+import datetime
+
+# Third-party imports
+# -------------------
+import pytest
+from redis.exceptions import ConnectionError
+
+# Local application imports
+# -------------------------
+from bookserver import cache
+from bookserver.crud import (
+    _dump_last_answer,
+    _load_last_answer,
+    create_answer_table_entry,
+    last_answer_key,
+)
+from bookserver.db import init_models
+from bookserver.models import validation_tables
+from bookserver.schemas import AssessmentRequest
+from .db_utils import add_course, remove_course
+
+
+# Support
+# =======
+# Provide the subset of the ``redis.asyncio.Redis`` API used by `cache.py`.
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+        self.calls = 0
+
+    def _check(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("Redis is down")
+
+    async def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self._check()
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    def _fake_redis(**kwargs):
+        client = FakeRedis(**kwargs)
+        monkeypatch.setattr(cache, "redis_client", client)
+        monkeypatch.setattr(cache, "_redis_retry_at", 0.0)
+        return client
+
+    return _fake_redis
+
+
+# Count calls to a memoized function.
+def make_doubler():
+    calls = []
+
+    @cache.redis_memoize(ttl=3, key=lambda x: f"double:{x}")
+    async def double(x):
+        calls.append(x)
+        return x * 2
+
+    return double, calls
+
+
+# Tests
+# =====
+@pytest.mark.asyncio
+async def test_memoize_hit_and_miss(fake_redis):
+    client = fake_redis()
+    double, calls = make_doubler()
+    assert await double(2) == 4
+    assert await double(2) == 4
+    assert await double(3) == 6
+    # The second call for 2 was a hit.
+    assert calls == [2, 3]
+    assert client.data["double:2"] == b"4"
+
+
+@pytest.mark.asyncio
+async def test_memoize_disabled(fake_redis, monkeypatch):
+    monkeypatch.setattr(cache, "redis_client", None)
+    double, calls = make_doubler()
+    assert await double(2) == 4
+    assert await double(2) == 4
+    assert calls == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_memoize_falls_back_when_redis_fails(fake_redis):
+    client = fake_redis(fail=True)
+    double, calls = make_doubler()
+    assert await double(2) == 4
+    assert await double(2) == 4
+    assert calls == [2, 2]
+    # After the first failure, Redis isn't tried again until the retry interval passes.
+    assert client.calls == 1
+
+
+def make_answer():
+    return validation_tables["mchoice_answers"](
+        timestamp=datetime.datetime.utcnow(),
+        div_id="test_cache_mc",
+        sid="test_cache_user",
+        course_name="test_cache_course",
+        correct=True,
+        answer="1",
+        percent=1.0,
+    )
+
+
+def test_last_answer_round_trip():
+    entry = make_answer()
+    query_data = AssessmentRequest(
+        course="test_cache_course", div_id="test_cache_mc", event="mChoice"
+    )
+    assert _load_last_answer(_dump_last_answer(entry), query_data) == entry
+    assert _load_last_answer(_dump_last_answer(None), query_data) is None
+
+
+@pytest.mark.asyncio
+async def test_answer_invalidates_last_answer(fake_redis):
+    client = fake_redis()
+    key = last_answer_key("test_cache_course", "test_cache_user", "test_cache_mc")
+    client.data[key] = b"null"
+    await init_models()
+    await add_course("test_cache_course")
+    try:
+        await create_answer_table_entry(make_answer(), "mChoice")
+    finally:
+        await remove_course("test_cache_course")
+    assert key not in client.data
@@ -8,7 +8,9 @@
 #
 # Standard library
 # ----------------
+import asyncio
 import datetime
+import uuid
 
 # Third-party imports
 # -------------------
@@ -20,7 +22,24 @@ import pytest
 # -------------------------
 from bookserver.models import UseinfoValidation
 from bookserver.main import app
+from bookserver.session import auth_manager, create_access_token
 from bookserver.applogger import rslogger
+from .db_utils import add_course, remove_course
+
+
+# Support
+# =======
+# Register a new user, returning the username. Each call uses a unique username, so tests don't depend on what's already in the database.
+def create_user(client, password="password_1"):
+    username = f"test_{uuid.uuid4().hex}"
+    response = client.post(
+        "/auth/newuser",
+        json=dict(
+            username=username, email=f"{username}@example.com", password=password
+        ),
+    )
+    assert response.status_code == 200
+    return username
 
 
 # Tests
@@ -31,6 +50,25 @@ def test_main():
         assert response.status_code == 200
 
 
+def test_health():
+    with TestClient(app) as client:
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert "status" in response.json()["pool"]
+
+
+def test_login():
+    with TestClient(app) as client:
+        username = create_user(client)
+        response = client.post(
+            "/auth/validate",
+            data=dict(username=username, password="password_1"),
+            allow_redirects=False,
+        )
+        assert response.is_redirect
+        assert "access_token" in response.cookies
+
+
 def test_add_log():
     item = dict(
         event="page",
@@ -93,6 +131,59 @@ def test_add_mchoice():
     # assert res["div_id"] == "test_mchoice_1"
 
 
+def test_no_saved_answer():
+    req = dict(
+        course="fopp",
+        div_id="test_no_saved_answer",
+        event="mChoice",
+    )
+    with TestClient(app) as client:
+        username = create_user(client)
+        client.cookies[auth_manager.cookie_name] = create_access_token(username)
+        response = client.post("/assessment/results", json=req)
+        assert response.status_code == 200
+        assert response.content == b'""'
+        assert response.headers["content-type"] == "application/json"
+
+
+def test_saved_answer():
+    course_name = f"test_saved_answer_{uuid.uuid4().hex}"
+    item = dict(
+        event="mChoice",
+        act="answer:2:correct",
+        answer="2",
+        correct="T",
+        div_id="test_saved_answer_mc",
+        course_name=course_name,
+        percent="1",
+        timestamp=datetime.datetime.utcnow().isoformat(),
+    )
+    req = dict(course=course_name, div_id="test_saved_answer_mc", event="mChoice")
+    with TestClient(app) as client:
+        # The ``TestClient`` runs the app on this thread's event loop; use the same loop to reach the database.
+        run = asyncio.get_event_loop().run_until_complete
+        run(add_course(course_name))
+        try:
+            username = create_user(client)
+            client.cookies[auth_manager.cookie_name] = create_access_token(username)
+            response = client.post("/logger/bookevent", json=item)
+            assert response.status_code == 201
+
+            response = client.post("/assessment/results", json=req)
+            assert response.status_code == 200
+            assert response.json()["div_id"] == "test_saved_answer_mc"
+            assert response.json()["answer"] == "2"
+
+            # The newest answer is returned.
+            item["answer"] = "1"
+            response = client.post("/logger/bookevent", json=item)
+            assert response.status_code == 201
+            response = client.post("/assessment/results", json=req)
+            assert response.json()["answer"] == "1"
+        finally:
+            run(remove_course(course_name))
+
+
 def test_schema_generator():
     with pytest.raises(ValidationError):
         # The sid Column has a max length of 512. This should fail validation.
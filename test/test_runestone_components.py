@@ -240,11 +240,11 @@ def test_lp_1(selenium_utils_user):
     id = "test_lp_1"
     su.wait_until_ready(id)
 
-    snippets = su.driver.find_elements_by_class_name("code_snippet")
+    snippets = su.driver.find_elements(By.CLASS_NAME, "code_snippet")
     assert len(snippets) == 1
-    check_button = su.driver.find_element_by_id(id)
+    check_button = su.driver.find_element(By.ID, id)
     result_id = "lp-result"
-    result_area = su.driver.find_element_by_id(result_id)
+    result_area = su.driver.find_element(By.ID, result_id)
 
     # Set snippets.
     code = "def one(): return 1"